@@ -8,6 +8,10 @@ Usage:
     python app.py [trace_file.json]
     
     If no trace file is provided, uses unified_trace_demo.json by default.
+    Set TRACE_DEBUG=1 to enable the Dash debugger.
+
+Production:
+    TRACE_FILE=trace_file.json waitress-serve --call app:get_wsgi
 """
 
 import sys
@@ -16,7 +20,7 @@ from pathlib import Path
 import dash
 from dash import dcc, html, Input, Output, callback
 import plotly.graph_objects as go
-from trace_parser import TraceParser, TraceVisualizer
+from trace_parser import TraceParser, TraceVisualizer, FigureResampler
 
 
 # Configuration
@@ -24,12 +28,54 @@ DEFAULT_TRACE_FILE = "unified_trace_demo.json"
 APP_TITLE = "MCU Trace Log Visualization"
 
 
-def get_trace_file_path():
-    """Get the trace file path from command line arguments or use default"""
-    if len(sys.argv) > 1:
-        trace_file = sys.argv[1]
-    else:
-        trace_file = DEFAULT_TRACE_FILE
+def _legend_item(color: str, label: str) -> str:
+    """HTML for one colored dot and its label in the color legend"""
+    return (f'<span style="color: {color}; font-size: 20px; margin-right: 5px">●</span>'
+            f'<span style="margin-right: 15px">{label}</span>')
+
+
+def _legend_group(title: str, color: str, rows: list) -> str:
+    """HTML for one event type's block of legend rows"""
+    rows_html = ''.join(f'<div style="margin-top: 5px">{"".join(row)}</div>' for row in rows)
+    return (f'<div style="display: inline-block; margin: 10px; vertical-align: top">'
+            f'<h4 style="color: {color}; margin-bottom: 10px">{title}</h4>{rows_html}</div>')
+
+
+# Static page content, rendered as single Markdown components rather than
+# trees of html components
+INSTRUCTIONS_MARKDOWN = """
+### Instructions
+
+- Each point on the timeline represents a trace event
+- Events are color-coded by type and operation (see legend)
+- Hover over any point to see detailed event information
+- Use mouse wheel or zoom controls to zoom in/out on the timeline
+- Click and drag to pan around the timeline
+- Double-click to reset zoom
+"""
+
+LEGEND_MARKDOWN = '<h3 style="margin-top: 30px; margin-bottom: 15px">Event Type Color Legend</h3><div>' + ''.join([
+    _legend_group("Bus Transactions", '#9b59b6', [
+        [_legend_item('#3498db', "READ operations"), _legend_item('#e74c3c', "WRITE operations")],
+    ]),
+    _legend_group("Device Events", '#34495e', [
+        [_legend_item('#2ecc71', "READ"), _legend_item('#f39c12', "WRITE")],
+        [_legend_item('#e67e22', "RESET"), _legend_item('#1abc9c', "ENABLE")],
+        [_legend_item('#95a5a6', "DISABLE"), _legend_item('#f1c40f', "DEMO_EVENT")],
+    ]),
+    _legend_group("IRQ Events", '#8e44ad', [
+        [_legend_item('#8e44ad', "Interrupt events")],
+    ]),
+]) + '</div>'
+
+
+def get_trace_file_path(trace_file: str = None):
+    """Get the trace file path from the argument, command line arguments or use default"""
+    if trace_file is None:
+        if len(sys.argv) > 1:
+            trace_file = sys.argv[1]
+        else:
+            trace_file = DEFAULT_TRACE_FILE
     
     # Make sure the path is absolute
     if not os.path.isabs(trace_file):
@@ -41,18 +87,30 @@ def get_trace_file_path():
     return trace_file
 
 
-def create_app_layout(trace_file_path: str):
-    """Create the main application layout"""
+def create_app_layout(trace_file_path: str, app: dash.Dash = None):
+    """Create the main application layout
+    
+    If app is given, zoom/pan callbacks are registered on it: the count of
+    events in view is kept up to date and, if plotly-resampler is installed,
+    the timeline graph is re-aggregated at full resolution.
+    """
     
     # Initialize parser and visualizer
     parser = TraceParser(trace_file_path)
     visualizer = TraceVisualizer(parser)
     
+    visualizer.prepare_data()
+    
     # Get summary stats
-    stats = visualizer.create_summary_stats()
+    stats = visualizer.summary_stats
     
     # Create the initial timeline figure
-    timeline_fig = visualizer.create_timeline_figure()
+    timeline_fig = visualizer.timeline_figure
+    
+    if app is not None:
+        if FigureResampler is not None and isinstance(timeline_fig, FigureResampler):
+            timeline_fig.register_update_graph_callback(app, 'timeline-graph')
+        register_visible_events_callback(app, visualizer)
     
     # App layout
     layout = html.Div([
@@ -67,62 +125,17 @@ def create_app_layout(trace_file_path: str):
         html.Div([
             html.H3("Trace Summary", style={'marginBottom': '15px'}),
             html.Div([
-                html.Div([
-                    html.H4("Total Events", style={'margin': '0', 'color': '#3498db'}),
-                    html.P(f"{stats['total_events']}", style={'fontSize': '24px', 'margin': '5px 0'})
-                ], className='stat-box', style={
-                    'display': 'inline-block', 'margin': '10px', 'padding': '15px',
-                    'border': '1px solid #ddd', 'borderRadius': '5px', 'textAlign': 'center',
-                    'minWidth': '120px'
-                }),
-                
-                html.Div([
-                    html.H4("Time Span", style={'margin': '0', 'color': '#e74c3c'}),
-                    html.P(f"{stats['time_span']['duration']:.6f}s", style={'fontSize': '18px', 'margin': '5px 0'})
-                ], className='stat-box', style={
-                    'display': 'inline-block', 'margin': '10px', 'padding': '15px',
-                    'border': '1px solid #ddd', 'borderRadius': '5px', 'textAlign': 'center',
-                    'minWidth': '120px'
-                }),
-                
-                html.Div([
-                    html.H4("Event Types", style={'margin': '0', 'color': '#2ecc71'}),
-                    html.Ul([
-                        html.Li(f"{event_type}: {count}") 
-                        for event_type, count in stats['event_types'].items()
-                    ], style={'textAlign': 'left', 'margin': '5px 0', 'fontSize': '14px'})
-                ], className='stat-box', style={
-                    'display': 'inline-block', 'margin': '10px', 'padding': '15px',
-                    'border': '1px solid #ddd', 'borderRadius': '5px', 'textAlign': 'center',
-                    'minWidth': '200px', 'verticalAlign': 'top'
-                }),
-                
-                html.Div([
-                    html.H4("Modules", style={'margin': '0', 'color': '#f39c12'}),
-                    html.Ul([
-                        html.Li(f"{module}: {count}") 
-                        for module, count in stats['modules'].items()
-                    ], style={'textAlign': 'left', 'margin': '5px 0', 'fontSize': '14px'})
-                ], className='stat-box', style={
-                    'display': 'inline-block', 'margin': '10px', 'padding': '15px',
-                    'border': '1px solid #ddd', 'borderRadius': '5px', 'textAlign': 'center',
-                    'minWidth': '200px', 'verticalAlign': 'top'
-                })
+                stat_box("Total Events", '#3498db',
+                         html.P(f"{stats['total_events']}", style={'fontSize': '24px', 'margin': '5px 0'})),
+                stat_box("Time Span", '#e74c3c',
+                         html.P(f"{stats['time_span']['duration']:.6f}s", style={'fontSize': '18px', 'margin': '5px 0'})),
+                stat_box("Event Types", '#2ecc71', stat_counts_list(stats['event_types']), min_width='200px'),
+                stat_box("Modules", '#f39c12', stat_counts_list(stats['modules']), min_width='200px')
             ], style={'textAlign': 'center', 'marginBottom': '30px'})
         ]),
         
         # Instructions
-        html.Div([
-            html.H3("Instructions", style={'marginBottom': '15px'}),
-            html.Ul([
-                html.Li("Each point on the timeline represents a trace event"),
-                html.Li("Events are color-coded by type and operation (see legend)"),
-                html.Li("Hover over any point to see detailed event information"),
-                html.Li("Use mouse wheel or zoom controls to zoom in/out on the timeline"),
-                html.Li("Click and drag to pan around the timeline"),
-                html.Li("Double-click to reset zoom")
-            ], style={'fontSize': '14px', 'marginBottom': '20px'})
-        ]),
+        dcc.Markdown(INSTRUCTIONS_MARKDOWN, style={'fontSize': '14px', 'marginBottom': '20px'}),
         
         # Main Timeline Visualization
         html.Div([
@@ -141,64 +154,89 @@ def create_app_layout(trace_file_path: str):
                         'scale': 1
                     }
                 }
-            )
+            ),
+            html.P(format_visible_events(stats['total_events'], stats['total_events']),
+                   id='visible-events', style={'textAlign': 'center', 'color': 'gray'})
         ]),
         
         # Event Type Legend/Details
-        html.Div([
-            html.H3("Event Type Color Legend", style={'marginTop': '30px', 'marginBottom': '15px'}),
-            html.Div([
-                # Bus Transaction Colors
-                html.Div([
-                    html.H4("Bus Transactions", style={'color': '#9b59b6', 'marginBottom': '10px'}),
-                    html.Div([
-                        html.Span("●", style={'color': '#3498db', 'fontSize': '20px', 'marginRight': '5px'}),
-                        html.Span("READ operations", style={'marginRight': '20px'}),
-                        html.Span("●", style={'color': '#e74c3c', 'fontSize': '20px', 'marginRight': '5px'}),
-                        html.Span("WRITE operations")
-                    ])
-                ], style={'display': 'inline-block', 'margin': '10px', 'verticalAlign': 'top'}),
-                
-                # Device Event Colors
-                html.Div([
-                    html.H4("Device Events", style={'color': '#34495e', 'marginBottom': '10px'}),
-                    html.Div([
-                        html.Div([
-                            html.Span("●", style={'color': '#2ecc71', 'fontSize': '20px', 'marginRight': '5px'}),
-                            html.Span("READ", style={'marginRight': '15px'}),
-                            html.Span("●", style={'color': '#f39c12', 'fontSize': '20px', 'marginRight': '5px'}),
-                            html.Span("WRITE")
-                        ]),
-                        html.Div([
-                            html.Span("●", style={'color': '#e67e22', 'fontSize': '20px', 'marginRight': '5px'}),
-                            html.Span("RESET", style={'marginRight': '15px'}),
-                            html.Span("●", style={'color': '#1abc9c', 'fontSize': '20px', 'marginRight': '5px'}),
-                            html.Span("ENABLE")
-                        ], style={'marginTop': '5px'}),
-                        html.Div([
-                            html.Span("●", style={'color': '#95a5a6', 'fontSize': '20px', 'marginRight': '5px'}),
-                            html.Span("DISABLE", style={'marginRight': '15px'}),
-                            html.Span("●", style={'color': '#f1c40f', 'fontSize': '20px', 'marginRight': '5px'}),
-                            html.Span("DEMO_EVENT")
-                        ], style={'marginTop': '5px'})
-                    ])
-                ], style={'display': 'inline-block', 'margin': '10px', 'verticalAlign': 'top'}),
-                
-                # IRQ Event Colors
-                html.Div([
-                    html.H4("IRQ Events", style={'color': '#8e44ad', 'marginBottom': '10px'}),
-                    html.Div([
-                        html.Span("●", style={'color': '#8e44ad', 'fontSize': '20px', 'marginRight': '5px'}),
-                        html.Span("Interrupt events")
-                    ])
-                ], style={'display': 'inline-block', 'margin': '10px', 'verticalAlign': 'top'})
-            ])
-        ])
+        dcc.Markdown(LEGEND_MARKDOWN, dangerously_allow_html=True)
     ], style={'margin': '20px', 'fontFamily': 'Arial, sans-serif'})
     
     return layout
 
 
+def stat_box(title: str, color: str, content, min_width: str = '120px'):
+    """Summary statistics box with a colored title above its content"""
+    return html.Div([
+        html.H4(title, style={'margin': '0', 'color': color}),
+        content
+    ], className='stat-box', style={
+        'display': 'inline-block', 'margin': '10px', 'padding': '15px',
+        'border': '1px solid #ddd', 'borderRadius': '5px', 'textAlign': 'center',
+        'minWidth': min_width, 'verticalAlign': 'top'
+    })
+
+
+def stat_counts_list(counts: dict):
+    """List of 'name: count' lines for a stat box"""
+    return html.Ul([
+        html.Li(f"{name}: {count}") for name, count in counts.items()
+    ], style={'textAlign': 'left', 'margin': '5px 0', 'fontSize': '14px'})
+
+
+def format_visible_events(visible: int, total: int) -> str:
+    """Text for the count of events in the visible time range
+    
+    This counts events, not drawn points: with plotly-resampler only a
+    downsampled subset of the events in range is plotted.
+    """
+    return f"{visible} of {total} events in range"
+
+
+def register_visible_events_callback(app: dash.Dash, visualizer: TraceVisualizer):
+    """Update the visible event count when the timeline is zoomed or panned"""
+    total_events = len(visualizer.events_df)
+    
+    @app.callback(Output('visible-events', 'children'),
+                  Input('timeline-graph', 'relayoutData'),
+                  prevent_initial_call=True)
+    def update_visible_events(relayout_data):
+        relayout_data = relayout_data or {}
+        if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+            t0, t1 = relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+        elif 'xaxis.range' in relayout_data:
+            t0, t1 = relayout_data['xaxis.range']
+        elif relayout_data.get('xaxis.autorange'):
+            return format_visible_events(total_events, total_events)
+        else:
+            # Not an x-axis change (e.g. y-only zoom); keep the current text
+            return dash.no_update
+        
+        visible_events = len(visualizer.slice_time(float(t0), float(t1)))
+        return format_visible_events(visible_events, total_events)
+
+
+def create_app(trace_file_path: str) -> dash.Dash:
+    """Create the Dash app; the trace file is parsed once, here"""
+    app = dash.Dash(__name__)
+    app.title = APP_TITLE
+    
+    # Set up the layout
+    app.layout = create_app_layout(trace_file_path, app)
+    
+    return app
+
+
+def get_wsgi():
+    """WSGI entry point for production servers (e.g. waitress, gunicorn)
+    
+    The trace file is taken from the TRACE_FILE environment variable.
+    """
+    trace_file_path = get_trace_file_path(os.environ.get('TRACE_FILE', DEFAULT_TRACE_FILE))
+    return create_app(trace_file_path).server
+
+
 def main():
     """Main application entry point"""
     try:
@@ -207,17 +245,15 @@ def main():
         print(f"Loading trace file: {trace_file_path}")
         
         # Initialize Dash app
-        app = dash.Dash(__name__)
-        app.title = APP_TITLE
-        
-        # Set up the layout
-        app.layout = create_app_layout(trace_file_path)
+        app = create_app(trace_file_path)
         
         print("Starting web server...")
         print("Open your browser and go to: http://127.0.0.1:8050")
         
-        # Run the app
-        app.run(debug=True, host='127.0.0.1', port=8050)
+        # Run the app; the debugger and its reloader (which parses the trace
+        # again in a second process) are opt-in
+        app.run(debug=os.environ.get('TRACE_DEBUG') == '1', host='127.0.0.1', port=8050,
+                dev_tools_hot_reload=False)
         
     except Exception as e:
         print(f"Error: {e}")
@@ -226,4 +262,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -3,9 +3,15 @@
 Simple test script to verify the trace parser and visualizer functionality.
 """
 
+import json
 import os
+import shutil
 import sys
-from trace_parser import TraceParser, TraceVisualizer
+import tempfile
+import pandas as pd
+from trace_parser import TraceParser, TraceVisualizer, ijson, pyarrow
+
+DEMO_TRACE_FILE = os.path.join(os.path.dirname(__file__), 'unified_trace_demo.json')
 
 def test_trace_parsing():
     """Test basic trace parsing functionality"""
@@ -20,7 +26,7 @@ def test_trace_parsing():
     try:
         # Test parser
         print("Testing TraceParser...")
-        parser = TraceParser(trace_file)
+        parser = TraceParser(trace_file, use_cache=False)
         trace_data = parser.load_trace_data()
         
         # Verify trace info
@@ -67,7 +73,6 @@ def test_trace_parsing():
         assert 'time_span' in stats
         print("✓ Summary statistics generation successful")
         
-        print("\n🎉 All tests passed! The visualization tool is working correctly.")
         return True
         
     except Exception as e:
@@ -76,6 +81,180 @@ def test_trace_parsing():
         traceback.print_exc()
         return False
 
+
+def test_event_type_filter():
+    """Events outside the event_types allow-list are dropped while parsing"""
+    bus_df = TraceParser(DEMO_TRACE_FILE, event_types=['BUS_TRANSACTION']).parse_events()
+    assert len(bus_df) == 5
+    assert set(bus_df['event_type'].unique()) == {'BUS_TRANSACTION'}
+    print("✓ Event type filtering successful")
+
+
+def test_ijson_backend():
+    """The streaming (ijson) backend parses the same events as the json backend"""
+    if ijson is None:
+        return
+    events_df = TraceParser(DEMO_TRACE_FILE, use_cache=False).parse_events()
+    stream_df = TraceParser(DEMO_TRACE_FILE, parser_backend='ijson', use_cache=False).parse_events()
+    assert stream_df.equals(events_df)
+    print("✓ Streaming (ijson) parsing matches json parsing")
+
+
+def test_parquet_cache():
+    """A second parse reads the Parquet cache; foreign Parquet files are ignored"""
+    if pyarrow is None:
+        return
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cached_trace = shutil.copy(DEMO_TRACE_FILE, tmp_dir)
+        parsed_df = TraceParser(cached_trace).parse_events()
+        assert os.path.exists(cached_trace + '.parquet')
+        cached_df = TraceParser(cached_trace).parse_events()
+        assert cached_df.equals(parsed_df)
+        # Foreign or unversioned Parquet files are ignored and overwritten
+        pd.DataFrame({'x': [1, 2]}).to_parquet(cached_trace + '.parquet')
+        assert TraceParser(cached_trace).parse_events().equals(parsed_df)
+        cache_metadata = pyarrow.parquet.read_schema(cached_trace + '.parquet').metadata
+        assert cache_metadata[TraceParser.CACHE_VERSION_KEY] == TraceParser.CACHE_VERSION
+    print("✓ Parquet cache round trip matches parsed events")
+
+
+def test_time_range_slicing():
+    """Events are sorted by timestamp and sliced by time range"""
+    visualizer = TraceVisualizer(TraceParser(DEMO_TRACE_FILE, use_cache=False))
+    visualizer.prepare_data()
+    timestamps = visualizer.events_df['timestamp']
+    assert timestamps.is_monotonic_increasing
+    window = visualizer.slice_time(timestamps.iloc[2], timestamps.iloc[5])
+    assert len(window) == ((timestamps >= timestamps.iloc[2]) & (timestamps <= timestamps.iloc[5])).sum()
+    assert len(visualizer.slice_time(0, 1)) == 0
+    print("✓ Time range slicing successful")
+
+
+def test_typed_event_data_columns():
+    """event_data fields get typed columns, including integers beyond int64"""
+    events_df = TraceParser(DEMO_TRACE_FILE, use_cache=False).parse_events()
+    assert str(events_df['data_width'].dtype) == 'Int64'
+    assert str(events_df['data_master_id'].dtype) == 'Int64'
+    assert str(events_df['data_success'].dtype) == 'boolean'
+    assert str(events_df['data_operation'].dtype) == 'category'
+    assert events_df['data_address'].dtype == object
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        wide_trace = os.path.join(tmp_dir, 'wide_ints.json')
+        _write_trace(wide_trace, [{'addr': 2**63, 'huge': 2**64}, {'addr': 1, 'huge': -1}])
+        # Parse twice with the default settings so the Parquet cache is
+        # written and then consulted
+        for _ in range(2):
+            wide_visualizer = TraceVisualizer(TraceParser(wide_trace))
+            wide_visualizer.prepare_data()
+            wide_df = wide_visualizer.events_df
+            assert str(wide_df['data_addr'].dtype) == 'UInt64'
+            assert wide_df['data_huge'].dtype == object
+            assert f"<b>Addr:</b> {2**63}" in wide_df['hover_text'].iloc[0]
+            assert f"<b>Huge:</b> {2**64}" in wide_df['hover_text'].iloc[0]
+        if ijson is not None:
+            wide_stream = TraceParser(wide_trace, parser_backend='ijson', use_cache=False).parse_events()
+            assert wide_stream['data_addr'].tolist() == [2**63, 1]
+            assert wide_stream['data_huge'].tolist() == [2**64, -1]
+    print("✓ Typed event data columns successful")
+
+
+def test_decode_wide_integers():
+    """Whole-document decoding keeps integers beyond 64 bits exact"""
+    values = [2**64, -2**63 - 1, 2**64 - 1, -2**63, 1754000000000000000]
+    assert TraceParser._decode_json(json.dumps(values).encode()) == values
+    # 19-digit values that fit 64 bits (e.g. nanosecond timestamps) keep the fast path
+    assert not TraceParser._has_wide_integer(json.dumps(values[2:]).encode())
+    print("✓ Wide integers decoded exactly")
+
+
+def test_timeline_legend():
+    """The timeline legend lists exactly the marker colors that are drawn"""
+    visualizer = TraceVisualizer(TraceParser(DEMO_TRACE_FILE, use_cache=False))
+    fig = visualizer.create_timeline_figure()
+    legend = {trace.name: trace.marker.color for trace in fig.data if trace.showlegend}
+    assert set(legend.values()) == set(visualizer.events_df['color'])
+    assert legend['BUS_TRANSACTION READ'] == '#3498db'
+    assert legend['DEVICE_EVENT WRITE'] == '#f39c12'
+    print("✓ Timeline legend matches marker colors")
+
+
+def _write_trace(path, events_data):
+    """Write a minimal trace file with one DEVICE_EVENT per event_data dict"""
+    with open(path, 'w') as f:
+        json.dump({'trace_info': {}, 'events': [
+            {'timestamp': float(i), 'formatted_time': f't{i}', 'module_name': 'CPU',
+             'event_type': 'DEVICE_EVENT', 'event_data': event_data}
+            for i, event_data in enumerate(events_data)
+        ]}, f)
+
+
+def test_parquet_cache_unsupported_values():
+    """Traces with values Parquet cannot store still parse with the cache enabled"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, events_data in [('huge', [{'value': 2**64}, {'value': 1}]),
+                                  ('empty', [{'extra': {}}, {'extra': {}}])]:
+            trace = os.path.join(tmp_dir, f'{name}.json')
+            _write_trace(trace, events_data)
+            first_df = TraceParser(trace).parse_events()
+            second_df = TraceParser(trace).parse_events()
+            assert len(first_df) == len(second_df) == 2
+            assert not os.path.exists(trace + '.parquet.tmp')
+    print("✓ Parquet cache skips values it cannot store")
+
+
+def _hover_texts(trace):
+    """Hover text of every event, parsed with the default (cached) settings"""
+    visualizer = TraceVisualizer(TraceParser(trace))
+    visualizer.prepare_data()
+    return visualizer.events_df['hover_text'].tolist()
+
+
+def test_parquet_cache_matches_fresh_parse():
+    """A cached parse shows exactly what a fresh parse shows"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        nested_trace = os.path.join(tmp_dir, 'nested.json')
+        _write_trace(nested_trace, [{'args': [1, 2], 'regs': {'a': 1}},
+                                    {'args': [3], 'regs': {'b': 'x'}}])
+        for trace in (shutil.copy(DEMO_TRACE_FILE, tmp_dir), nested_trace):
+            fresh = _hover_texts(trace)
+            assert _hover_texts(trace) == fresh
+        assert "<b>Args:</b> [1, 2]" in fresh[0]
+        assert "<b>Regs:</b> {'a': 1}" in fresh[0]
+    print("✓ Cached parse matches fresh parse")
+
+
+def test_parquet_cache_tracks_trace_file():
+    """The cache is rebuilt when the trace changes, even if its mtime goes back"""
+    if pyarrow is None:
+        return
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        trace = os.path.join(tmp_dir, 'trace.json')
+        _write_trace(trace, [{'value': 'aaa'}, {'value': 'bbb'}])
+        TraceParser(trace).parse_events()
+        assert os.path.exists(trace + '.parquet')
+        # Same size, different content, mtime older than the cache (as after
+        # cp -p or git checkout)
+        _write_trace(trace, [{'value': 'ccc'}, {'value': 'ddd'}])
+        old_mtime = os.path.getmtime(trace + '.parquet') - 60
+        os.utime(trace, (old_mtime, old_mtime))
+        assert TraceParser(trace).parse_events()['data_value'].tolist() == ['ccc', 'ddd']
+        cache_metadata = pyarrow.parquet.read_schema(trace + '.parquet').metadata
+        assert cache_metadata[TraceParser.CACHE_MTIME_KEY] == str(os.stat(trace).st_mtime_ns).encode()
+    print("✓ Parquet cache tracks the trace file's size and mtime")
+
+
 if __name__ == '__main__':
     success = test_trace_parsing()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    if success:
+        test_event_type_filter()
+        test_ijson_backend()
+        test_parquet_cache()
+        test_time_range_slicing()
+        test_typed_event_data_columns()
+        test_decode_wide_integers()
+        test_timeline_legend()
+        test_parquet_cache_unsupported_values()
+        test_parquet_cache_matches_fresh_parse()
+        test_parquet_cache_tracks_trace_file()
+        print("\n🎉 All tests passed! The visualization tool is working correctly.")
+    sys.exit(0 if success else 1)
@@ -6,11 +6,50 @@ Supports interactive timeline visualization with zoom, pan, and hover details.
 """
 
 import json
+import os
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
-from typing import Dict, List, Any, Tuple
+from functools import cached_property
+from itertools import islice
+from typing import Dict, List, Any, Tuple, Iterable, Iterator, Optional, Union
+from pandas.api.extensions import ExtensionArray
+from pandas.api.types import infer_dtype
+
+# Optional fast JSON decoder for the whole-document ('json') backend
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional streaming JSON parser; ijson picks its fastest available backend
+# (yajl2_c when compiled, pure Python otherwise)
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional server-side downsampling (LTTB) of large timelines
+try:
+    from plotly_resampler import FigureResampler
+except ImportError:
+    FigureResampler = None
+
+# Optional Parquet support for caching parsed events
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Byte translation table mapping ASCII digits to b'0', keeping b'-' and
+# mapping everything else to b' ', used to find long digit runs quickly
+_DIGIT_MASK = bytes(ord('0') if ord('0') <= i <= ord('9') else i if i == ord('-') else ord(' ')
+                    for i in range(256))
+# Bytes translated with _DIGIT_MASK at a time, bounding the extra memory
+_DIGIT_SCAN_CHUNK = 1 << 20
 
 
 class EventType:
@@ -48,72 +87,446 @@ class DeviceOperation:
 class TraceParser:
     """Parser for trace log JSON files"""
     
-    def __init__(self, trace_file_path: str):
+    # Fallback color for unknown event types
+    DEFAULT_COLOR = '#7f7f7f'
+    
+    # Colors per event type and operation; 'default' applies to any other operation
+    COLOR_MAP = {
+        EventType.BUS_TRANSACTION: {
+            BusOperation.READ: '#3498db',     # Blue
+            BusOperation.WRITE: '#e74c3c',    # Red
+            'default': '#9b59b6'              # Purple
+        },
+        EventType.DEVICE_EVENT: {
+            DeviceOperation.READ: '#2ecc71',          # Green
+            DeviceOperation.WRITE: '#f39c12',         # Orange
+            DeviceOperation.RESET: '#e67e22',         # Dark Orange
+            DeviceOperation.ENABLE: '#1abc9c',        # Turquoise
+            DeviceOperation.DISABLE: '#95a5a6',       # Gray
+            'DEMO_EVENT': '#f1c40f',                   # Yellow for demo events
+            'default': '#34495e'                       # Dark Gray
+        },
+        EventType.IRQ_EVENT: {
+            'default': '#8e44ad'              # Dark Purple
+        }
+    }
+    
+    # Supported JSON parser backends
+    PARSER_BACKENDS = ('json', 'ijson')
+    
+    # Format version stored in the Parquet cache metadata; bump it whenever the
+    # cached columns or their dtypes change so older caches are re-parsed
+    CACHE_VERSION = b'1'
+    CACHE_VERSION_KEY = b'trace_cache_version'
+    # Metadata keys recording the trace file the cache was built from
+    CACHE_MTIME_KEY = b'trace_mtime_ns'
+    CACHE_SIZE_KEY = b'trace_size'
+    
+    def __init__(self, trace_file_path: str, parser_backend: str = 'json',
+                 event_types: Optional[Iterable[str]] = None, use_cache: bool = True):
+        """
+        Args:
+            trace_file_path: Path to the trace JSON file
+            parser_backend: 'json' loads the whole file at once, 'ijson' streams
+                events straight from the file without keeping the raw event list
+            event_types: Optional allow-list of event types; other events are
+                dropped while parsing
+            use_cache: Keep parsed events in a Parquet file next to the trace
+                file and reuse it while the trace's size and modification time
+                are unchanged (requires pyarrow; ignored when event_types is given)
+        """
+        if parser_backend not in self.PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend: {parser_backend}")
+        if parser_backend == 'ijson' and ijson is None:
+            raise ImportError("The 'ijson' parser backend requires the ijson package")
+        
         self.trace_file_path = trace_file_path
+        self.parser_backend = parser_backend
+        self.event_type_filter = set(event_types) if event_types is not None else None
+        # Cached columns hold every event, so the cache is not used when filtering
+        self.use_cache = use_cache and pyarrow is not None and self.event_type_filter is None
         self.trace_data = None
         self.events_df = None
         
+        # Parsed events, stored column-wise (filled by load_events)
+        self.timestamps: Optional[np.ndarray] = None
+        self.formatted_times: Optional[np.ndarray] = None
+        self.module_names: Optional[pd.Categorical] = None
+        self.event_types: Optional[pd.Categorical] = None
+        self.event_data_cols: Dict[str, Union[np.ndarray, ExtensionArray]] = {}
+        
+        # Flatten COLOR_MAP into {(event_type, operation): color}; the per-type
+        # default is stored under operation None
+        self.color_map = {
+            (event_type, None if operation == 'default' else operation): color
+            for event_type, colors in self.COLOR_MAP.items()
+            for operation, color in colors.items()
+        }
+        
     def load_trace_data(self) -> Dict[str, Any]:
-        """Load trace data from JSON file"""
+        """Load trace data from JSON file
+        
+        With the 'ijson' backend only trace_info is loaded here; events are
+        streamed from the file by iter_events.
+        """
+        if self.parser_backend == 'ijson':
+            self.trace_data = {'trace_info': next(self._stream_items('trace_info'), {})}
+            return self.trace_data
+        
         try:
-            with open(self.trace_file_path, 'r') as f:
-                self.trace_data = json.load(f)
+            if orjson is not None:
+                with open(self.trace_file_path, 'rb') as f:
+                    self.trace_data = self._decode_json(f.read())
+            else:
+                with open(self.trace_file_path, 'r') as f:
+                    self.trace_data = json.load(f)
             return self.trace_data
         except FileNotFoundError:
             raise FileNotFoundError(f"Trace file not found: {self.trace_file_path}")
         except json.JSONDecodeError:
             raise ValueError(f"Invalid JSON format in file: {self.trace_file_path}")
     
+    @staticmethod
+    def _decode_json(raw: bytes) -> Any:
+        """Decode JSON with orjson, falling back to the json module
+        
+        orjson rejects NaN/Infinity, which json.dump can write, and silently
+        turns integers outside the int64/uint64 ranges into floats. Documents
+        containing such integers and documents orjson rejects are decoded with
+        json instead.
+        """
+        if TraceParser._has_wide_integer(raw):
+            return json.loads(raw)
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return json.loads(raw)
+    
+    @staticmethod
+    def _has_wide_integer(raw: bytes) -> bool:
+        """Whether raw contains a digit run outside [-2**63, 2**64)
+        
+        Only runs of 20 or more digits, or negative runs of 19 or more, can be
+        out of range (so 19-digit nanosecond timestamps never match); they are
+        located by translating one chunk at a time with _DIGIT_MASK and
+        searching it with bytes.find, which is much faster than a regex scan.
+        Runs inside strings or floats are checked too, which at worst costs a
+        slower decode.
+        """
+        patterns = (b'0' * 20, b'-' + b'0' * 19)
+        pos = 0
+        while pos < len(raw):
+            end = pos + _DIGIT_SCAN_CHUNK
+            # Overlap the next chunk so runs crossing the boundary are found
+            mask = raw[pos:end + 19].translate(_DIGIT_MASK)
+            for pattern in patterns:
+                hit = mask.find(pattern)
+                while hit != -1:
+                    start = stop = pos + hit + (pattern[0] == ord('-'))
+                    while start > 0 and ord('0') <= raw[start - 1] <= ord('9'):
+                        start -= 1
+                    while stop < len(raw) and ord('0') <= raw[stop] <= ord('9'):
+                        stop += 1
+                    # 2**64 has 20 digits; anything longer is out of range
+                    if stop - start > 20:
+                        return True
+                    value = int(raw[start:stop])
+                    if start > 0 and raw[start - 1] == ord('-'):
+                        value = -value
+                    if not -2**63 <= value < 2**64:
+                        return True
+                    hit = mask.find(pattern, stop - pos)
+            pos = end
+        return False
+    
+    def _stream_items(self, prefix: str) -> Iterator[Any]:
+        """Stream the JSON items found under prefix using ijson
+        
+        The C backend rejects integers outside the int64 range as an overflow;
+        in that case streaming resumes after the items already yielded using
+        ijson's pure Python backend, which decodes them exactly.
+        """
+        backend = ijson
+        yielded = 0
+        while True:
+            try:
+                with open(self.trace_file_path, 'rb') as f:
+                    for item in islice(backend.items(f, prefix, use_float=True), yielded, None):
+                        yielded += 1
+                        yield item
+                return
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Trace file not found: {self.trace_file_path}")
+            except ijson.JSONError as e:
+                if backend.backend_name != 'python' and 'integer overflow' in str(e):
+                    backend = ijson.get_backend('python')
+                    continue
+                raise ValueError(f"Invalid JSON format in file: {self.trace_file_path}")
+    
+    def iter_events(self) -> Iterator[Dict[str, Any]]:
+        """Yield raw event dicts, skipping event types outside the allow-list"""
+        if self.parser_backend == 'ijson':
+            events = self._stream_items('events.item')
+        else:
+            if not self.trace_data:
+                self.load_trace_data()
+            events = self.trace_data['events']
+        
+        for event in events:
+            if self.event_type_filter is None or event['event_type'] in self.event_type_filter:
+                yield event
+    
+    @property
+    def cache_path(self) -> str:
+        """Path of the Parquet cache for this trace file"""
+        return f"{self.trace_file_path}.parquet"
+    
+    def load_events(self):
+        """Load events into column arrays in a single pass over the trace
+        
+        The columns are sorted by timestamp afterwards.
+        """
+        # The trace is stat'ed before it is read, so a trace rewritten while
+        # it is being parsed leaves a cache that no longer matches it
+        cache_metadata = self._cache_metadata() if self.use_cache else None
+        if cache_metadata is not None and self._load_cached_events(cache_metadata):
+            self._sort_by_time()
+            return
+        
+        timestamps = []
+        formatted_times = []
+        module_names = []
+        event_types = []
+        data_cols: Dict[str, List[Any]] = {}
+        
+        count = 0
+        for event in self.iter_events():
+            timestamps.append(event['timestamp'])
+            formatted_times.append(event['formatted_time'])
+            module_names.append(event['module_name'])
+            event_types.append(event['event_type'])
+            
+            # Pad columns with None for events that did not carry the key
+            for key, value in event.get('event_data', {}).items():
+                col = data_cols.get(key)
+                if col is None:
+                    col = data_cols[key] = []
+                if len(col) < count:
+                    col.extend([None] * (count - len(col)))
+                col.append(value)
+            count += 1
+        
+        for col in data_cols.values():
+            col.extend([None] * (count - len(col)))
+        
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.formatted_times = np.asarray(formatted_times, dtype=object)
+        # Module and event type names repeat heavily; store them as categories
+        # (ordered by first appearance) to save memory and speed up grouping
+        self.module_names = self._to_categorical(module_names)
+        self.event_types = self._to_categorical(event_types)
+        self.event_data_cols = {key: self._to_column(key, col) for key, col in data_cols.items()}
+        self._sort_by_time()
+        
+        if cache_metadata is not None:
+            self._save_events_cache(cache_metadata)
+    
+    def _sort_by_time(self):
+        """Stable-sort all event columns by timestamp (no-op if already sorted)"""
+        if np.all(self.timestamps[1:] >= self.timestamps[:-1]):
+            return
+        
+        order = np.argsort(self.timestamps, kind='stable')
+        self.timestamps = self.timestamps[order]
+        self.formatted_times = self.formatted_times[order]
+        self.module_names = self.module_names[order]
+        self.event_types = self.event_types[order]
+        self.event_data_cols = {key: col[order] for key, col in self.event_data_cols.items()}
+    
+    def time_range_indices(self, t0: float, t1: float) -> Tuple[int, int]:
+        """Row range [i0, i1) of the events with t0 <= timestamp <= t1"""
+        if self.timestamps is None:
+            self.load_events()
+        i0 = int(np.searchsorted(self.timestamps, t0, side='left'))
+        i1 = int(np.searchsorted(self.timestamps, t1, side='right'))
+        return i0, i1
+    
+    def slice_time(self, t0: float, t1: float) -> pd.DataFrame:
+        """Events with t0 <= timestamp <= t1"""
+        if self.events_df is None:
+            self.parse_events()
+        i0, i1 = self.time_range_indices(t0, t1)
+        return self.events_df.iloc[i0:i1]
+    
+    def _cache_metadata(self) -> Optional[Dict[bytes, bytes]]:
+        """Parquet cache metadata for the current state of the trace file
+        
+        Holds the cache format version and the trace file's modification time
+        and size; None if the trace file cannot be stat'ed.
+        """
+        try:
+            stat = os.stat(self.trace_file_path)
+        except OSError:
+            return None
+        return {
+            self.CACHE_VERSION_KEY: self.CACHE_VERSION,
+            self.CACHE_MTIME_KEY: str(stat.st_mtime_ns).encode(),
+            self.CACHE_SIZE_KEY: str(stat.st_size).encode(),
+        }
+    
+    def _load_cached_events(self, cache_metadata: Dict[bytes, bytes]) -> bool:
+        """Fill the event columns from the Parquet cache if it matches cache_metadata
+        
+        Caches written by another format version or for another state of the
+        trace file (an exact modification time and size match is required),
+        or lacking the expected columns, are treated as a miss.
+        """
+        try:
+            metadata = pyarrow.parquet.read_schema(self.cache_path).metadata or {}
+            if any(metadata.get(key) != value for key, value in cache_metadata.items()):
+                return False
+            events_df = pyarrow.parquet.read_table(self.cache_path).to_pandas()
+            timestamps = events_df['timestamp'].to_numpy(dtype=np.float64)
+            formatted_times = events_df['formatted_time'].to_numpy(dtype=object)
+            module_names = events_df['module_name'].array
+            event_types = events_df['event_type'].array
+        except (OSError, ValueError, TypeError, KeyError, pyarrow.ArrowException):
+            # Missing, unreadable or foreign cache; fall back to parsing the trace
+            return False
+        if not (isinstance(module_names, pd.Categorical) and isinstance(event_types, pd.Categorical)):
+            return False
+        
+        self.timestamps = timestamps
+        self.formatted_times = formatted_times
+        self.module_names = module_names
+        self.event_types = event_types
+        self.event_data_cols = {
+            col[len('data_'):]: events_df[col].values
+            for col in events_df.columns if col.startswith('data_')
+        }
+        return True
+    
+    def _save_events_cache(self, cache_metadata: Dict[bytes, bytes]):
+        """Write the event columns to the Parquet cache (best effort)"""
+        events_df = self._build_events_df()
+        # Parquet reads lists back as arrays and dicts as structs with every
+        # key filled in, so only traces whose object columns hold plain
+        # strings are cached
+        if any(events_df[col].dtype == object
+               and infer_dtype(events_df[col], skipna=True) not in ('string', 'empty')
+               for col in events_df.columns):
+            return
+        
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            table = pyarrow.Table.from_pandas(events_df, preserve_index=False)
+            metadata = {**(table.schema.metadata or {}), **cache_metadata}
+            pyarrow.parquet.write_table(table.replace_schema_metadata(metadata), tmp_path,
+                                        compression='zstd')
+            os.replace(tmp_path, self.cache_path)
+        except (OSError, ValueError, TypeError, OverflowError, pyarrow.ArrowException):
+            # Unwritable directory or values Parquet cannot store (e.g. mixed
+            # types in one field, integers beyond 64 bits or empty objects);
+            # the trace is simply parsed again next time
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    # event_data fields holding a small set of repeated strings
+    CATEGORICAL_DATA_FIELDS = ('operation', 'device_name')
+    
+    @classmethod
+    def _to_column(cls, key: str, values: List[Any]) -> Union[np.ndarray, ExtensionArray]:
+        """Convert one event_data field's values to a typed column
+        
+        Integer and boolean fields become nullable Int64 (UInt64 for unsigned
+        64-bit values)/boolean arrays (rather than float64/object when some
+        events lack the field), float fields
+        float64 and enum-like string fields categories. Anything else, such as
+        hex strings, stays an object array.
+        """
+        if key in cls.CATEGORICAL_DATA_FIELDS:
+            return cls._to_categorical(values)
+        
+        column = np.empty(len(values), dtype=object)
+        column[:] = values
+        kind = infer_dtype(column, skipna=True)
+        if kind == 'integer':
+            return cls._to_integer_column(column)
+        if kind == 'boolean':
+            return pd.array(column, dtype='boolean')
+        if kind in ('floating', 'mixed-integer-float'):
+            return np.array(values, dtype=np.float64)
+        return column
+    
+    @staticmethod
+    def _to_integer_column(column: np.ndarray) -> Union[np.ndarray, ExtensionArray]:
+        """Pick the nullable integer type that holds every value of column
+        
+        Values from 2**63 up to 2**64 - 1 (e.g. 64-bit addresses) need UInt64;
+        values outside both 64-bit ranges stay Python ints in an object column.
+        """
+        present = column[pd.notna(column)]
+        if len(present) == 0:
+            return pd.array(column, dtype='Int64')
+        low, high = min(present), max(present)
+        if low >= -2**63 and high < 2**63:
+            return pd.array(column, dtype='Int64')
+        if low >= 0 and high < 2**64:
+            return pd.array(column, dtype='UInt64')
+        return column
+    
+    @staticmethod
+    def _to_categorical(values: List[str]) -> pd.Categorical:
+        """Build a Categorical whose categories keep first-appearance order"""
+        codes, categories = pd.factorize(np.asarray(values, dtype=object))
+        return pd.Categorical.from_codes(codes, categories=categories)
+    
     def parse_events(self) -> pd.DataFrame:
         """Parse events into a pandas DataFrame for easier processing"""
-        if not self.trace_data:
-            self.load_trace_data()
-            
-        events = []
-        for event in self.trace_data['events']:
-            parsed_event = {
-                'timestamp': event['timestamp'],
-                'formatted_time': event['formatted_time'],
-                'module_name': event['module_name'],
-                'event_type': event['event_type'],
-            }
-            
-            # Flatten event_data for easier access
-            if 'event_data' in event:
-                for key, value in event['event_data'].items():
-                    parsed_event[f'data_{key}'] = value
-            
-            events.append(parsed_event)
+        if self.timestamps is None:
+            self.load_events()
         
-        self.events_df = pd.DataFrame(events)
+        self.events_df = self._build_events_df()
         return self.events_df
     
+    def _build_events_df(self) -> pd.DataFrame:
+        """Wrap the event columns in a DataFrame without copying them"""
+        columns = {
+            'timestamp': self.timestamps,
+            'formatted_time': self.formatted_times,
+            'module_name': self.module_names,
+            'event_type': self.event_types,
+        }
+        # Flatten event_data for easier access
+        columns.update({f'data_{key}': values for key, values in self.event_data_cols.items()})
+        
+        return pd.DataFrame(columns, copy=False)
+    
     def get_event_color(self, event_type: str, operation: str = None) -> str:
         """Get color for event based on type and operation"""
-        color_map = {
-            EventType.BUS_TRANSACTION: {
-                BusOperation.READ: '#3498db',     # Blue
-                BusOperation.WRITE: '#e74c3c',    # Red
-                'default': '#9b59b6'              # Purple
-            },
-            EventType.DEVICE_EVENT: {
-                DeviceOperation.READ: '#2ecc71',          # Green
-                DeviceOperation.WRITE: '#f39c12',         # Orange
-                DeviceOperation.RESET: '#e67e22',         # Dark Orange
-                DeviceOperation.ENABLE: '#1abc9c',        # Turquoise
-                DeviceOperation.DISABLE: '#95a5a6',       # Gray
-                'DEMO_EVENT': '#f1c40f',                   # Yellow for demo events
-                'default': '#34495e'                       # Dark Gray
-            },
-            EventType.IRQ_EVENT: {
-                'default': '#8e44ad'              # Dark Purple
-            }
-        }
+        if operation and (event_type, operation) in self.color_map:
+            return self.color_map[(event_type, operation)]
+        return self.color_map.get((event_type, None), self.DEFAULT_COLOR)
+    
+    def get_event_colors(self, event_types: pd.Series, operations: Optional[pd.Series] = None) -> pd.Series:
+        """Vectorized get_event_color over aligned event type and operation columns
+        
+        get_event_color is evaluated once per distinct (event type, operation)
+        pair and the results are broadcast back to every event by code.
+        """
+        type_codes, type_uniques = pd.factorize(event_types)
+        if operations is not None:
+            op_codes, op_uniques = pd.factorize(operations)
+        else:
+            op_codes, op_uniques = np.full(len(event_types), -1), []
+        
+        # Lookup table; the extra last row/column (code -1) covers missing values
+        table = np.array([
+            [self.get_event_color(event_type, operation) for operation in list(op_uniques) + [None]]
+            for event_type in list(type_uniques) + [None]
+        ], dtype=object)
         
-        event_colors = color_map.get(event_type, {})
-        if operation and operation in event_colors:
-            return event_colors[operation]
-        return event_colors.get('default', '#7f7f7f')
+        return pd.Series(table[type_codes, op_codes], index=event_types.index)
     
     def create_hover_text(self, row: pd.Series) -> str:
         """Create detailed hover text for an event"""
@@ -141,53 +554,154 @@ class TraceVisualizer:
         self.events_df = None
         
     def prepare_data(self):
-        """Prepare data for visualization"""
+        """Prepare data for visualization (runs once per visualizer)"""
+        if self.events_df is not None:
+            return
+        
         self.events_df = self.parser.parse_events()
         
-        # Add y-position for timeline (group by module_name for lanes)
-        unique_modules = self.events_df['module_name'].unique()
-        module_positions = {module: i for i, module in enumerate(unique_modules)}
-        self.events_df['y_position'] = self.events_df['module_name'].map(module_positions)
+        # Add y-position for timeline (group by module_name for lanes); module
+        # categories are in first-appearance order, so the codes are the lanes
+        self.events_df['y_position'] = self.events_df['module_name'].cat.codes.astype(np.int32)
         
         # Add colors
-        colors = []
-        for _, row in self.events_df.iterrows():
-            operation = row.get('data_operation', None)
-            color = self.parser.get_event_color(row['event_type'], operation)
-            colors.append(color)
-        self.events_df['color'] = colors
+        operations = self.events_df['data_operation'] if 'data_operation' in self.events_df.columns else None
+        self.events_df['color'] = self.parser.get_event_colors(self.events_df['event_type'], operations).values
         
-        # Add hover text
-        self.events_df['hover_text'] = self.events_df.apply(self.parser.create_hover_text, axis=1)
+        # Add hover text, concatenated column-wise; missing data fields add nothing
+        hover_text = ('<b>Time:</b> ' + self.events_df['formatted_time'].astype(str)
+                      + '<br><b>Module:</b> ' + self.events_df['module_name'].astype(str)
+                      + '<br><b>Event Type:</b> ' + self.events_df['event_type'].astype(str)).values
+        data_fields = [col for col in self.events_df.columns if col.startswith('data_')]
+        for field in data_fields:
+            field_name = field.replace('data_', '').replace('_', ' ').title()
+            values = self.events_df[field]
+            hover_text = hover_text + np.where(values.notna(),
+                                               f"<br><b>{field_name}:</b> " + values.astype(str), '')
+        self.events_df['hover_text'] = hover_text
+    
+    def slice_time(self, t0: float, t1: float) -> pd.DataFrame:
+        """Prepared events with t0 <= timestamp <= t1"""
+        if self.events_df is None:
+            self.prepare_data()
+        # events_df rows are in the parser's (timestamp sorted) order
+        i0, i1 = self.parser.time_range_indices(t0, t1)
+        return self.events_df.iloc[i0:i1]
+    
+    @cached_property
+    def event_type_counts(self) -> Dict[str, int]:
+        """Number of events per event type, most frequent first"""
+        if self.events_df is None:
+            self.prepare_data()
+        return self._count_values(self.events_df['event_type'])
+    
+    @cached_property
+    def module_counts(self) -> Dict[str, int]:
+        """Number of events per module, most frequent first"""
+        if self.events_df is None:
+            self.prepare_data()
+        return self._count_values(self.events_df['module_name'])
+    
+    @staticmethod
+    def _count_values(values: pd.Series) -> Dict[str, int]:
+        """Count occurrences of each value, most frequent first
+        
+        For categorical columns value_counts(sort=False) is a bincount over the
+        category codes; categories without events are dropped.
+        """
+        counts = values.value_counts(sort=False)
+        counts = counts[counts > 0].sort_values(ascending=False, kind='stable')
+        return counts.to_dict()
+    
+    @cached_property
+    def summary_stats(self) -> Dict[str, Any]:
+        """Summary statistics, computed on first access"""
+        return self.create_summary_stats()
+    
+    @cached_property
+    def timeline_figure(self) -> go.Figure:
+        """Timeline figure, built on first access"""
+        return self.create_timeline_figure()
+    
+    def legend_entries(self) -> List[Tuple[str, str]]:
+        """(label, color) for each event type and marker color on the timeline
+        
+        Entries are labelled with the operation drawn in that color, or
+        '(other)' when several operations share the event type's default color.
+        """
+        if self.events_df is None:
+            self.prepare_data()
+        
+        columns = ['event_type', 'color']
+        if 'data_operation' in self.events_df.columns:
+            columns.append('data_operation')
+        # Distinct (type, color, operation) rows, grouped by event type in
+        # first-appearance (category) order
+        pairs = self.events_df[columns].drop_duplicates().sort_values('event_type', kind='stable')
+        
+        entries = []
+        for (event_type, color), group in pairs.groupby(['event_type', 'color'], sort=False, observed=True):
+            if len(group) > 1:
+                name = f"{event_type} (other)"
+            elif 'data_operation' in group.columns and pd.notna(group['data_operation'].iloc[0]):
+                name = f"{event_type} {group['data_operation'].iloc[0]}"
+            else:
+                name = str(event_type)
+            entries.append((name, color))
+        return entries
     
     def create_timeline_figure(self) -> go.Figure:
         """Create the main timeline visualization"""
         if self.events_df is None:
             self.prepare_data()
         
-        fig = go.Figure()
+        # With plotly-resampler the full-resolution data stays server side and
+        # only a downsampled view of the current x-range is sent to the browser
+        if FigureResampler is not None:
+            fig = FigureResampler(go.Figure())
+        else:
+            fig = go.Figure()
         
-        # Group events by type for legend
-        event_types = self.events_df['event_type'].unique()
+        # All events go into a single WebGL trace colored per point
+        trace = go.Scattergl(
+            mode='markers',
+            marker=dict(
+                size=10,
+                line=dict(width=1, color='white')
+            ),
+            hovertemplate='%{text}<extra></extra>',
+            name='Events',
+            showlegend=False
+        )
+        x = self.events_df['timestamp'].values
+        y = self.events_df['y_position'].values
+        text = self.events_df['hover_text'].values
+        colors = self.events_df['color'].values
         
-        for event_type in event_types:
-            type_events = self.events_df[self.events_df['event_type'] == event_type]
-            
+        if FigureResampler is not None:
+            fig.add_trace(trace, hf_x=x, hf_y=y, hf_text=text, hf_marker_color=colors)
+        else:
+            trace.update(x=x, y=y, text=text, marker_color=colors)
+            fig.add_trace(trace)
+        
+        # Empty traces that only provide one legend entry per color drawn
+        for name, color in self.legend_entries():
             fig.add_trace(go.Scatter(
-                x=type_events['timestamp'],
-                y=type_events['y_position'],
+                x=[None],
+                y=[None],
                 mode='markers',
-                marker=dict(
-                    color=type_events['color'],
-                    size=10,
-                    line=dict(width=1, color='white')
-                ),
-                text=type_events['hover_text'],
-                hovertemplate='%{text}<extra></extra>',
-                name=event_type,
+                marker=dict(color=color, size=10),
+                name=name,
                 showlegend=True
             ))
         
+        # Module lanes, in y_position order
+        module_names = self.events_df['module_name']
+        if isinstance(module_names.dtype, pd.CategoricalDtype):
+            modules = module_names.cat.categories
+        else:
+            modules = pd.unique(module_names)
+        
         # Customize layout
         fig.update_layout(
             title=dict(
@@ -205,8 +719,8 @@ class TraceVisualizer:
             yaxis=dict(
                 title="Module",
                 tickmode='array',
-                tickvals=list(range(len(self.events_df['module_name'].unique()))),
-                ticktext=list(self.events_df['module_name'].unique()),
+                tickvals=np.arange(len(modules)),
+                ticktext=list(modules),
                 showgrid=True,
                 gridwidth=1,
                 gridcolor='lightgray',
@@ -226,14 +740,20 @@ class TraceVisualizer:
         if self.events_df is None:
             self.prepare_data()
         
+        # Use the earliest/latest events rather than the first/last rows so the
+        # span is also right for traces that are not in timestamp order
+        timestamps = self.events_df['timestamp'].values
+        formatted_times = self.events_df['formatted_time'].values
+        start, end = timestamps.argmin(), timestamps.argmax()
+        
         stats = {
             'total_events': len(self.events_df),
-            'event_types': self.events_df['event_type'].value_counts().to_dict(),
-            'modules': self.events_df['module_name'].value_counts().to_dict(),
+            'event_types': self.event_type_counts,
+            'modules': self.module_counts,
             'time_span': {
-                'start': self.events_df['formatted_time'].iloc[0],
-                'end': self.events_df['formatted_time'].iloc[-1],
-                'duration': self.events_df['timestamp'].iloc[-1] - self.events_df['timestamp'].iloc[0]
+                'start': formatted_times[start],
+                'end': formatted_times[end],
+                'duration': float(timestamps[end] - timestamps[start])
             }
         }
         